@@ -4,9 +4,12 @@ import io
 import os
 import re
 import datetime
+import html
+import json
 import logging
 import argparse
 import collections
+import concurrent.futures
 from pyzotero import zotero
 from config import ZOTERO_CONFIGS
 
@@ -55,6 +58,9 @@ def find_collection_key(collections_dict, collection_name):
     for key, value in collections_dict.items():
         if value['Name'] == collection_name:
             return value['Key']
+    # Fall back to treating the query as a collection key
+    if collection_name in collections_dict:
+        return collection_name
     logging.warning(f"Collection '{collection_name}' not found.")
     return None
 
@@ -125,15 +131,64 @@ def extract_notes(note_items):
             "note" in n['data']['itemType'] and not n['data']['note'].startswith('The following values')]
 
 
-def format_note(zot, note, collections_dict, default="None"):
+def is_annotation_note(note):
     notes_raw = note.get('note', '')
-    if notes_raw.startswith('<p><strong>Extracted Annotations') or notes_raw.startswith('<p><b>Extracted Annotations'):
-        parent_id = note.get('parentItem')
+    return notes_raw.startswith('<p><strong>Extracted Annotations') or notes_raw.startswith('<p><b>Extracted Annotations')
+
+
+def fetch_parent_items(zot, parent_ids, parent_cache):
+    """
+    Fetch parent items missing from parent_cache, 50 keys per request.
+
+    Args:
+        zot: Zotero instance
+        parent_ids (iterable): Parent item keys that will be needed
+        parent_cache (dict): Item key -> item, updated in place
+
+    Returns:
+        list: Keys that could not be fetched
+    """
+    missing = sorted({pid for pid in parent_ids if pid and pid not in parent_cache})
+    for i in range(0, len(missing), 50):
+        batch = missing[i:i + 50]
         try:
-            parent_doc = zot.item(parent_id)
+            for item in zot.items(itemKey=",".join(batch), limit=50):
+                parent_cache[item['key']] = item
         except Exception as e:
-            logging.error(f"Error fetching parent item {parent_id}: {e}")
-            return None
+            logging.error(f"Error fetching parent items {batch}: {e}")
+    logging.debug(f"Parent cache: {len(parent_cache)} items ({len(missing)} requested).")
+    return [pid for pid in missing if pid not in parent_cache]
+
+
+def cache_parent_items(search_result, parent_cache):
+    """Add regular items from a collection listing to parent_cache so they are not fetched again."""
+    for item in search_result:
+        if item['data']['itemType'] not in ('note', 'attachment'):
+            parent_cache[item['key']] = item
+    return parent_cache
+
+
+def parse_note(zot, note, collections_dict, default="None", parent_cache=None):
+    """
+    Build a format-independent record for an annotation note.
+
+    Returns:
+        dict: Record with 'parentItem', 'collection', 'title', 'date', 'creators'
+              and 'note' (the note HTML), or None if the note is not an annotation note
+    """
+    notes_raw = note.get('note', '')
+    if is_annotation_note(note):
+        parent_id = note.get('parentItem')
+        if parent_cache is not None and parent_id in parent_cache:
+            parent_doc = parent_cache[parent_id]
+        else:
+            try:
+                parent_doc = zot.item(parent_id)
+            except Exception as e:
+                logging.error(f"Error fetching parent item {parent_id}: {e}")
+                return None
+            if parent_cache is not None:
+                parent_cache[parent_id] = parent_doc
         match = re.search(r"(?<!\d)\d{4,20}(?!\d)", parent_doc['data'].get('date', ''))
         parent_date = match.group(0) if match else "N.d."
         try:
@@ -148,14 +203,28 @@ def format_note(zot, note, collections_dict, default="None"):
         except Exception as e:
             logging.error(f"Error building breadcrumb for note: {e}")
             bread_crumb = default
-        parent_title = parent_doc['data'].get('title', "No Title")
-        parent_creators = parent_doc['meta'].get('creatorSummary', "No Author")
-        if not notes_raw:
-            return "\\i No Notes"
-        return f"\\i {bread_crumb}\\i0 \\line \\fs28 \\b {parent_title} ({parent_date})  \\b0 \\fs22 \\line {parent_creators} \\line \\fs24 {notes_raw}"
+        return {
+            'parentItem': parent_id,
+            'collection': bread_crumb,
+            'title': parent_doc['data'].get('title', "No Title"),
+            'date': parent_date,
+            'creators': parent_doc['meta'].get('creatorSummary', "No Author"),
+            'note': notes_raw,
+        }
     return None
 
 
+def rtf_package(record):
+    if not record['note']:
+        return "\\i No Notes"
+    return f"\\i {record['collection']}\\i0 \\line \\fs28 \\b {record['title']} ({record['date']})  \\b0 \\fs22 \\line {record['creators']} \\line \\fs24 {record['note']}"
+
+
+def format_note(zot, note, collections_dict, default="None", parent_cache=None):
+    record = parse_note(zot, note, collections_dict, default, parent_cache)
+    return rtf_package(record) if record else None
+
+
 def rtf_replacements(output):
     replacements = [
         ("(<a href=", "{\\field{\\*\\fldinst { HYPERLINK"),
@@ -186,71 +255,193 @@ def rtf_replacements(output):
     return output
 
 
-def write_rtf_file(file_path, collection_query, output):
+def markdown_escape(text):
+    """Backslash-escape characters Markdown would read as formatting or HTML."""
+    return re.sub(r'([\\`*_\[\]<>&#|])', r'\\\1', str(text))
+
+
+def html_to_markdown(text):
+    text = re.sub(r'<a href="([^"]*)">(.*?)</a>', r'[\2](\1)', text, flags=re.S)
+    text = re.sub(r'</?(strong|b)>', '**', text)
+    text = re.sub(r'</?(em|i)>', '*', text)
+    text = re.sub(r'<br\s*/?>', '  \n', text)
+    text = text.replace('</p>', '\n\n')
+    text = re.sub(r'<[^>]+>', '', text)
+    text = html.unescape(text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+class RtfRenderer:
+    """The original RTF output."""
+    name = "rtf"
+    extension = "rtf"
+    separator = "\\par"
+    rtf_header = (
+        "{\\rtf1\\ansi\\ansicpg1252\\deff0\\deftab720{\\fonttbl{\\f0\\fswiss MS Sans Serif;}"
+        "{\\f1\\froman\\fcharset2 Symbol;}{\\f2\\fmodern\\fprq1 Courier New;}"
+        "{\\f3\\froman Times New Roman;}}{\\colortbl\\red0\\green0\\blue0;"
+        "\\red0\\green0\\blue255;\\red255\\green0\\blue0;}\\deflang1033\\horzdoc{\\*\\fchars }{\\*\\lchars}"
+    )
+
+    def header(self, title):
+        return self.rtf_header
+
+    def render(self, record):
+        return rtf_replacements(rtf_package(record))
+
+    def footer(self):
+        return "\\par}"
+
+    def check(self, first_line):
+        return first_line.startswith("{\\rtf1")
+
+
+class MarkdownRenderer:
+    name = "md"
+    extension = "md"
+    separator = "\n---\n\n"
+
+    def header(self, title):
+        return f"# {markdown_escape(title)}\n\n"
+
+    def render(self, record):
+        return (f"*{markdown_escape(record['collection'])}*\n\n"
+                f"## {markdown_escape(record['title'])} ({record['date']})\n\n"
+                f"{markdown_escape(record['creators'])}\n\n"
+                f"{html_to_markdown(record['note']) or '*No Notes*'}\n")
+
+    def footer(self):
+        return ""
+
+    def check(self, first_line):
+        return first_line.startswith("# ")
+
+
+class HtmlRenderer:
+    name = "html"
+    extension = "html"
+    separator = "\n"
+
+    def header(self, title):
+        title = html.escape(title)
+        return (f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{title}</title>\n</head>\n"
+                f"<body>\n<h1>{title}</h1>\n")
+
+    def render(self, record):
+        return (f"<article>\n<p><em>{html.escape(record['collection'])}</em></p>\n"
+                f"<h2>{html.escape(record['title'])} ({html.escape(record['date'])})</h2>\n"
+                f"<p>{html.escape(record['creators'])}</p>\n"
+                f"{record['note'] or '<p><em>No Notes</em></p>'}\n</article>\n")
+
+    def footer(self):
+        return "</body>\n</html>\n"
+
+    def check(self, first_line):
+        return first_line.startswith("<!DOCTYPE html>")
+
+
+class JsonLinesRenderer:
+    """One JSON object per note, with the note HTML as-is."""
+    name = "jsonl"
+    extension = "jsonl"
+    separator = ""
+
+    def header(self, title):
+        return ""
+
+    def render(self, record):
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    def footer(self):
+        return ""
+
+    def check(self, first_line):
+        if not first_line.strip():
+            return True
+        try:
+            json.loads(first_line)
+            return True
+        except ValueError:
+            return False
+
+
+RENDERERS = {renderer.name: renderer for renderer in (RtfRenderer, MarkdownRenderer, HtmlRenderer, JsonLinesRenderer)}
+
+
+def parse_formats(value):
+    """Turn a comma separated format list (e.g. 'rtf,md') into renderer instances."""
+    names = list(dict.fromkeys(name.strip().lower() for name in value.split(',') if name.strip()))
+    unknown = [name for name in names if name not in RENDERERS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"Unknown format(s): {', '.join(unknown) or value!r}. Choose from: {', '.join(RENDERERS)}")
+    return [RENDERERS[name]() for name in names]
+
+
+def write_output_file(file_path, collection_query, renderer, records, verbose=True):
     """
-    Write RTF file with comprehensive error checking and user notifications.
+    Stream records to one output file with comprehensive error checking and user notifications.
 
     Args:
         file_path (str): Directory path where the file should be written
         collection_query (str): Collection name for filename
-        output (str): RTF content to write
+        renderer: Renderer for the output format (see RENDERERS)
+        records (list): Note records from parse_note
+        verbose (bool): Print progress; errors are always logged
 
     Returns:
         bool: True if file was written successfully, False otherwise
     """
+    report = print if verbose else (lambda *args, **kwargs: None)
     timestamp = datetime.datetime.strftime(datetime.datetime.now(), '%Y-%m-%d')
-    rtf_header = (
-        "{\\rtf1\\ansi\\ansicpg1252\\deff0\\deftab720{\\fonttbl{\\f0\\fswiss MS Sans Serif;}"
-        "{\\f1\\froman\\fcharset2 Symbol;}{\\f2\\fmodern\\fprq1 Courier New;}"
-        "{\\f3\\froman Times New Roman;}}{\\colortbl\\red0\\green0\\blue0;"
-        "\\red0\\green0\\blue255;\\red255\\green0\\blue0;}\\deflang1033\\horzdoc{\\*\\fchars }{\\*\\lchars}"
-    )
 
     # Sanitize collection_query for filename (remove invalid characters)
     safe_collection_name = "".join(c for c in collection_query if c.isalnum() or c in (' ', '-', '_')).strip()
-    filename = f"{file_path}{safe_collection_name}_Zotero_notes_{timestamp}.rtf"
+    filename = f"{file_path}{safe_collection_name}_Zotero_notes_{timestamp}.{renderer.extension}"
 
-    print("🔍 Pre-flight checks:")
-    print(f"   📝 Target file: {filename}")
+    report("🔍 Pre-flight checks:")
+    report(f"   📝 Target file: {filename}")
 
     try:
         # Check if directory exists
         directory = os.path.dirname(filename) if os.path.dirname(filename) else file_path
         if not os.path.exists(directory):
             logging.error(f"Directory does not exist: {directory}")
-            print(f"   ❌ Directory does not exist: {directory}")
+            report(f"   ❌ Directory does not exist: {directory}")
             return False
         else:
-            print(f"   ✅ Directory exists: {directory}")
+            report(f"   ✅ Directory exists: {directory}")
 
         # Check if directory is writable
         if not os.access(directory, os.W_OK):
             logging.error(f"Directory is not writable: {directory}")
-            print(f"   ❌ Directory is not writable. Check permissions.")
+            report(f"   ❌ Directory is not writable. Check permissions.")
             return False
         else:
-            print(f"   ✅ Directory is writable")
+            report(f"   ✅ Directory is writable")
 
         # Check if file already exists and warn user
         if os.path.exists(filename):
             logging.warning(f"File already exists and will be overwritten: {filename}")
-            print(f"   ⚠️  File exists and will be overwritten")
+            report(f"   ⚠️  File exists and will be overwritten")
 
-        # Check if output content is empty
-        if not output or not output.strip():
+        # Check if there is anything to write
+        if not records:
             logging.warning("No content to write to file.")
-            print("   ⚠️  No content to write")
+            report("   ⚠️  No content to write")
         else:
-            content_length = len(output)
-            print(f"   ✅ Content ready: {content_length:,} characters")
+            report(f"   ✅ Content ready: {len(records):,} notes")
 
-        print("\n💾 Writing file...")
+        report("\n💾 Writing file...")
 
-        # Write the file
+        # Stream the file one record at a time
         with io.open(filename, 'w+', encoding="utf-8") as f:
-            f.write(rtf_header)
-            f.write(output + "\\par")
-            f.write("}")
+            f.write(renderer.header(collection_query))
+            for i, record in enumerate(records):
+                if i:
+                    f.write(renderer.separator)
+                f.write(renderer.render(record))
+            f.write(renderer.footer())
 
         # Verify file was written and get size
         if os.path.exists(filename):
@@ -259,45 +450,244 @@ def write_rtf_file(file_path, collection_query, output):
             # Quick content validation
             with open(filename, 'r', encoding="utf-8") as f:
                 first_line = f.readline()
-                if first_line.startswith("{\\rtf1"):
-                    rtf_valid = "✅ RTF header verified"
+                if renderer.check(first_line):
+                    header_valid = f"✅ {renderer.name.upper()} header verified"
                 else:
-                    rtf_valid = "⚠️  RTF header may be invalid"
+                    header_valid = f"⚠️  {renderer.name.upper()} header may be invalid"
 
-            logging.info(f"RTF file written successfully: {filename} ({file_size} bytes)")
-            print(f"\n✅ File written successfully!")
-            print(f"   📁 Location: {filename}")
-            print(f"   📏 Size: {file_size:,} bytes")
-            print(f"   {rtf_valid}")
+            logging.info(f"{renderer.name.upper()} file written successfully: {filename} ({file_size} bytes)")
+            report(f"\n✅ File written successfully!")
+            report(f"   📁 Location: {filename}")
+            report(f"   📏 Size: {file_size:,} bytes")
+            report(f"   {header_valid}")
             return True
         else:
             logging.error(f"File was not created: {filename}")
-            print(f"❌ File was not created: {filename}")
+            report(f"❌ File was not created: {filename}")
             return False
 
     except PermissionError as e:
         logging.error(f"Permission denied when writing file: {e}")
-        print(f"❌ ERROR: Permission denied. Cannot write to '{filename}'.")
-        print("   Check file permissions and ensure the file is not open in another program.")
+        report(f"❌ ERROR: Permission denied. Cannot write to '{filename}'.")
+        report("   Check file permissions and ensure the file is not open in another program.")
         return False
 
     except UnicodeEncodeError as e:
         logging.error(f"Unicode encoding error: {e}")
-        print(f"❌ ERROR: Unicode encoding error when writing file.")
-        print("   Some characters in the content cannot be encoded in CP1252.")
+        report(f"❌ ERROR: Unicode encoding error when writing file.")
+        report("   Some characters in the content cannot be encoded in CP1252.")
         return False
 
     except OSError as e:
         logging.error(f"OS error when writing file: {e}")
-        print(f"❌ ERROR: System error when writing file: {e}")
+        report(f"❌ ERROR: System error when writing file: {e}")
         return False
 
     except Exception as e:
-        logging.error(f"Unexpected error writing RTF file: {e}")
-        print(f"❌ ERROR: Unexpected error when writing file: {e}")
+        logging.error(f"Unexpected error writing {renderer.name.upper()} file: {e}")
+        report(f"❌ ERROR: Unexpected error when writing file: {e}")
         return False
 
 
+def write_outputs(file_path, collection_query, renderers, records, verbose=True):
+    """
+    Write the same records in every requested format, one thread per format.
+
+    Progress output is only printed when a single format is written, so that
+    parallel writers do not interleave.
+
+    Returns:
+        dict: Format name -> True if that file was written successfully
+    """
+    if len(renderers) == 1:
+        return {renderers[0].name: write_output_file(file_path, collection_query, renderers[0], records, verbose)}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(renderers)) as executor:
+        futures = {renderer.name: executor.submit(write_output_file, file_path, collection_query, renderer,
+                                                  records, False)
+                   for renderer in renderers}
+        results = {name: future.result() for name, future in futures.items()}
+    if verbose:
+        for name, success in results.items():
+            print(f"   {'✅' if success else '❌'} {name.upper()} output {'written' if success else 'failed'}")
+    return results
+
+
+def read_collection_queries(names=None, list_file=None):
+    """
+    Combine collection names/keys from the command line and a list file.
+
+    The list file has one collection name or key per line; blank lines and
+    lines starting with '#' are ignored.
+    """
+    queries = list(names or [])
+    if list_file:
+        with io.open(list_file, 'r', encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    queries.append(line)
+    # Drop duplicates but keep the given order
+    return list(dict.fromkeys(queries))
+
+
+def render_collection(file_path, collection_query, collection_name, notes, collections_dict, parent_cache,
+                      renderers):
+    """
+    Parse one collection's notes and write it in every requested format. Runs
+    in a worker process, so the per-file progress output is suppressed in
+    favour of the batch summary. parent_cache must hold every parent item;
+    the worker has no Zotero instance to fetch missing ones.
+
+    Returns:
+        dict: Per-collection result with 'collection', 'notes', 'success' and 'error'
+    """
+    result = {'collection': collection_query, 'notes': 0, 'success': False, 'error': None}
+    try:
+        missing = sorted({note.get('parentItem') for note in notes} - set(parent_cache))
+        if missing:
+            result['error'] = f"Parent items not available: {', '.join(map(str, missing))}"
+            return result
+        records = [parse_note(None, note, collections_dict, parent_cache=parent_cache) for note in notes]
+        result['notes'] = len(records)
+        written = write_outputs(file_path, collection_name, renderers, records, verbose=False)
+        failed = [name.upper() for name, success in written.items() if not success]
+        result['success'] = not failed
+        if failed:
+            result['error'] = f"The {', '.join(failed)} file(s) could not be written."
+    except Exception as e:
+        logging.error(f"Error rendering collection '{collection_query}': {e}")
+        result['error'] = str(e)
+    return result
+
+
+def export_collections(zot, file_path, collection_queries, workers=None, renderers=None):
+    """
+    Export several collections in one run.
+
+    The collection tree is loaded once and parent items are fetched once into a
+    cache shared by every collection. Rendering and writing each collection's
+    files is done in a process pool.
+
+    Args:
+        zot: Zotero instance
+        file_path (str): Directory path where the files should be written
+        collection_queries (list): Collection names or keys
+        workers (int): Number of worker processes (default: CPU count)
+        renderers (list): Output formats from parse_formats (default: RTF only)
+
+    Returns:
+        dict: Summary with 'succeeded' and 'failed' lists of per-collection results
+    """
+    summary = {'succeeded': [], 'failed': []}
+    renderers = renderers or [RtfRenderer()]
+
+    collections_dict = build_collections_dict(zot)
+    if not collections_dict:
+        for query in collection_queries:
+            summary['failed'].append({'collection': query, 'notes': 0, 'success': False,
+                                      'error': "No collections found."})
+        return summary
+
+    # Fetch note items for every collection before rendering anything
+    jobs = []
+    seen_keys = {}
+    duplicates = []
+    parent_cache = {}
+    for query in collection_queries:
+        search_key = find_collection_key(collections_dict, query)
+        if not search_key:
+            summary['failed'].append({'collection': query, 'notes': 0, 'success': False,
+                                      'error': "Collection not found."})
+            continue
+        # A name and a key can point at the same collection
+        if search_key in seen_keys:
+            logging.warning(f"Collection '{query}' is the same as '{seen_keys[search_key]}', skipping.")
+            duplicates.append((query, seen_keys[search_key]))
+            continue
+        seen_keys[search_key] = query
+        print(f"📚 Fetching items from collection: {query}")
+        try:
+            search_result = zot.everything(zot.collection_items(search_key))
+        except Exception as e:
+            logging.error(f"Error fetching items for collection '{query}': {e}")
+            summary['failed'].append({'collection': query, 'notes': 0, 'success': False, 'error': str(e)})
+            continue
+        cache_parent_items(search_result, parent_cache)
+        # Standalone notes have no parent item to build a heading from
+        notes = [note for note in extract_notes(filter_note_items(search_result))
+                 if is_annotation_note(note) and note.get('parentItem')]
+        jobs.append((query, search_key, notes))
+
+    # Collections sharing a name get their key added so their files do not collide
+    name_counts = collections.Counter(collections_dict[key]['Name'] for _, key, _ in jobs)
+    jobs = [(query, collections_dict[key]['Name'] if name_counts[collections_dict[key]['Name']] == 1
+             else f"{collections_dict[key]['Name']} {key}", notes)
+            for query, key, notes in jobs]
+
+    # Only parents outside the requested collections still need a request
+    missing = fetch_parent_items(zot, (note.get('parentItem') for _, _, notes in jobs for note in notes),
+                                 parent_cache)
+    # Retry anything a batch request missed one item at a time
+    parent_errors = {}
+    for parent_id in missing:
+        try:
+            parent_cache[parent_id] = zot.item(parent_id)
+        except Exception as e:
+            logging.error(f"Error fetching parent item {parent_id}: {e}")
+            parent_errors[parent_id] = str(e)
+
+    ready = []
+    for query, name, notes in jobs:
+        failed_parents = sorted({note.get('parentItem') for note in notes} & set(parent_errors))
+        if failed_parents:
+            error = "; ".join(f"{pid}: {parent_errors[pid]}" for pid in failed_parents)
+            summary['failed'].append({'collection': query, 'notes': 0, 'success': False,
+                                      'error': f"Could not fetch parent items ({error})"})
+        else:
+            ready.append((query, name, notes))
+    jobs = ready
+
+    print(f"🖨  Rendering {len(jobs)} collections...")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for query, name, notes in jobs:
+            # Only ship the parents this collection needs to the worker
+            parents = {note.get('parentItem'): parent_cache[note.get('parentItem')]
+                       for note in notes if note.get('parentItem') in parent_cache}
+            future = executor.submit(render_collection, file_path, query, name, notes, collections_dict, parents,
+                                     renderers)
+            futures[future] = query
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                logging.error(f"Worker failed for collection '{futures[future]}': {e}")
+                result = {'collection': futures[future], 'notes': 0, 'success': False, 'error': str(e)}
+            summary['succeeded' if result['success'] else 'failed'].append(result)
+
+    # Duplicate queries share the result of the first query for that collection
+    results_by_query = {r['collection']: r for results in summary.values() for r in results}
+    for query, first_query in duplicates:
+        result = dict(results_by_query[first_query], collection=query, duplicate_of=first_query)
+        summary['succeeded' if result['success'] else 'failed'].append(result)
+
+    # Report in the order the collections were requested
+    order = {query: i for i, query in enumerate(collection_queries)}
+    for results in summary.values():
+        results.sort(key=lambda r: order.get(r['collection'], len(order)))
+    return summary
+
+
+def print_batch_summary(summary):
+    print(f"\n📋 Batch summary: {len(summary['succeeded'])} succeeded, {len(summary['failed'])} failed")
+    for result in summary['succeeded']:
+        same = f" (same as '{result['duplicate_of']}')" if result.get('duplicate_of') else ""
+        print(f"   ✅ {result['collection']}: {result['notes']} notes{same}")
+    for result in summary['failed']:
+        same = f" (same as '{result['duplicate_of']}')" if result.get('duplicate_of') else ""
+        print(f"   ❌ {result['collection']}: {result['error']}{same}")
+
+
 def list_groups(zot):
     groups = zot.groups()
     print("Groups:")
@@ -312,6 +702,14 @@ def main():
     parser.add_argument('--list-groups', action='store_true', help='List all groups and exit')
     parser.add_argument('--collections-with-notes', action='store_true',
                         help='List collections with note counts and exit')
+    parser.add_argument('--collections', nargs='+', metavar='NAME_OR_KEY',
+                        help='Export several collections (names or keys) in one batch run')
+    parser.add_argument('--collections-file', metavar='PATH',
+                        help='File with one collection name or key per line to export in one batch run')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of worker processes for batch rendering (default: CPU count)')
+    parser.add_argument('--format', dest='renderers', type=parse_formats, default='rtf',
+                        help=f"Comma separated output formats: {', '.join(RENDERERS)} (default: rtf)")
     parser.add_argument('collection_query', nargs='?', default=None, help='Collection name to process')
     args = parser.parse_args()
 
@@ -355,6 +753,20 @@ def main():
         list_collections_with_notes(zot)
         sys.exit(0)
 
+    if args.collections or args.collections_file:
+        try:
+            collection_queries = read_collection_queries(args.collections, args.collections_file)
+        except OSError as e:
+            logging.error(f"Could not read collections file: {e}")
+            sys.exit(1)
+        if not collection_queries:
+            logging.error("No collections given for batch export.")
+            sys.exit(1)
+        print(f"🔍 Processing {len(collection_queries)} collections")
+        summary = export_collections(zot, file_path, collection_queries, args.workers, args.renderers)
+        print_batch_summary(summary)
+        sys.exit(1 if summary['failed'] else 0)
+
     collection_query = args.collection_query or config.get("collectionQuery", "")
     if not collection_query:
         logging.error("No collection query provided.")
@@ -381,11 +793,15 @@ def main():
 
     print(f"📝 Processing {len(note_items)} items for notes...")
 
+    # Fetch and parse once; every output format is rendered from the same records
+    note_data = extract_notes(note_items)
+    parent_cache = cache_parent_items(search_result, {})
+    fetch_parent_items(zot, (note.get('parentItem') for note in note_data if is_annotation_note(note)), parent_cache)
     notes = []
-    for note in extract_notes(note_items):
-        formatted = format_note(zot, note, collections_dict)
-        if formatted:
-            notes.append(formatted)
+    for note in note_data:
+        record = parse_note(zot, note, collections_dict, parent_cache=parent_cache)
+        if record:
+            notes.append(record)
 
     if not notes:
         logging.warning("No notes found for the collection.")
@@ -393,19 +809,17 @@ def main():
     else:
         print(f"✅ Found {len(notes)} notes to process")
 
-    output = "\\par".join(notes)
-    output = rtf_replacements(output)
-
-    # Write the RTF file with enhanced error checking
-    success = write_rtf_file(file_path, collection_query, output)
+    # Write the output files with enhanced error checking
+    results = write_outputs(file_path, collection_query, args.renderers, notes)
+    failed = [name.upper() for name, success in results.items() if not success]
 
-    if success:
+    if not failed:
         print(f"\n🎉 Process completed successfully!")
         print(f"   📚 Collection: {collection_query}")
         print(f"   📝 Notes processed: {len(notes)}")
     else:
         print(f"\n💥 Process failed!")
-        print(f"   The RTF file could not be written.")
+        print(f"   The {', '.join(failed)} file(s) could not be written.")
         sys.exit(1)
 
 
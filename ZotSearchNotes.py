@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 import sys
 import io
+import os
 import re
+import gzip
+import json
 import datetime
 from pyzotero import zotero
 from config import ZOTERO_CONFIGS
@@ -14,10 +17,12 @@ def get_config():
     secret_key = config["secretKey"]
     file_path = config["filePath"]
     search_query = config["searchQuery"]
+    # Local full-text cache, kept next to the exported notes unless configured
+    fulltext_cache = config.get("fullTextCache") or os.path.join(file_path, ".zotero_fulltext.json.gz")
     # Allow override from command line
     if len(sys.argv) > 1:
         search_query = sys.argv[1]
-    return user_id, secret_key, file_path, search_query
+    return user_id, secret_key, file_path, search_query, fulltext_cache
 
 def detect_and_normalize(text):
     import unicodedata
@@ -64,8 +69,114 @@ def rtf_replace(text):
                 .replace("&amp;", "&")
                 .replace("\u02C7", "&#728;"))
 
+def load_fulltext_cache(cache_path):
+    # Cache layout: {"version": library version, "items": {attachment key: {parent, version, content}},
+    #                "pending": {attachment key: version}} where pending holds downloads to retry
+    try:
+        with gzip.open(cache_path, 'rt', encoding='utf-8') as f:
+            cache = json.load(f)
+        cache.setdefault('version', 0)
+        cache.setdefault('items', {})
+        cache.setdefault('pending', {})
+        return cache
+    except (OSError, ValueError):
+        return {'version': 0, 'items': {}, 'pending': {}}
+
+def save_fulltext_cache(cache_path, cache):
+    # Write to a temporary file first so an interrupted run keeps the old cache
+    tmp_path = cache_path + ".tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+def sync_fulltext(zot, cache_path):
+    cache = load_fulltext_cache(cache_path)
+    since = cache['version']
+    items = cache['items']
+
+    # Only attachments whose full text changed since the last sync are returned
+    try:
+        changed = zot.new_fulltext(since)
+        deleted = zot.deleted(since=since).get('items', []) if since else []
+    except Exception as e:
+        # Full text is optional; search with whatever is already cached
+        print(f"Full text not synced, using cached text: {e}")
+        return cache
+    # Retry attachments that failed to download on an earlier run
+    pending = cache['pending']
+    for key, version in pending.items():
+        changed.setdefault(key, version)
+
+    removed = 0
+    for key in deleted:
+        changed.pop(key, None)
+        if items.pop(key, None) is not None:
+            removed += 1
+
+    # Look up the parent of each changed attachment, 50 keys per request
+    keys = list(changed)
+    parents = {}
+    for i in range(0, len(keys), 50):
+        try:
+            for att in zot.items(itemKey=",".join(keys[i:i + 50]), limit=50):
+                parents[att['key']] = att['data'].get('parentItem', '')
+        except Exception as e:
+            print(f"Could not look up attachments {keys[i:i + 50]}: {e}")
+
+    updated = 0
+    failed = {}
+    for key, version in changed.items():
+        if key not in parents:
+            failed[key] = version
+            continue
+        try:
+            content = zot.fulltext_item(key).get('content', '')
+        except Exception as e:
+            print(f"Skipping full text for {key}, will retry next run: {e}")
+            failed[key] = version
+            continue
+        items[key] = {'parent': parents[key], 'version': version, 'content': content}
+        updated += 1
+
+    # Failed keys are kept in pending, so the version can still move forward
+    cache['pending'] = failed
+    cache['version'] = max([since] + list(changed.values()))
+    if updated or removed or failed != pending or cache['version'] != since:
+        save_fulltext_cache(cache_path, cache)
+    print(f"Full text synced: {updated} updated, {removed} removed, {len(failed)} failed, {len(items)} cached")
+    return cache
+
+def search_fulltext(cache, search_query, width=80, limit=3):
+    # Map parent item key -> short context snippets around each match
+    pattern = re.compile(re.escape(search_query), re.IGNORECASE)
+    matches = {}
+    for entry in cache['items'].values():
+        parent = entry.get('parent')
+        content = entry.get('content', '')
+        if not parent or not content:
+            continue
+        snippets = matches.setdefault(parent, [])
+        last_end = 0
+        for match in pattern.finditer(content):
+            if len(snippets) >= limit:
+                break
+            # Matches inside the previous window are already shown
+            if match.start() < last_end:
+                continue
+            start = max(match.start() - width, last_end)
+            end = min(match.end() + width, len(content))
+            last_end = end
+            snippet = " ".join(content[start:end].split())
+            snippets.append(("..." if start else "") + snippet + ("..." if end < len(content) else ""))
+        if not snippets:
+            del matches[parent]
+    return matches
+
+def rtf_escape(text):
+    return text.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}")
+
 def main():
-    user_id, secret_key, file_path, search_query = get_config()
+    user_id, secret_key, file_path, search_query, fulltext_cache = get_config()
     zot = zotero.Zotero(user_id, 'user', secret_key, preserve_json_order=True)
 
     # Fetch collections and build lookup
@@ -84,6 +195,24 @@ def main():
         if item['data']['itemType'] != 'attachment'
     ]
 
+    # Match PDF body text locally and add parents the remote search missed
+    fulltext = sync_fulltext(zot, fulltext_cache)
+    snippets = search_fulltext(fulltext, search_query)
+    found_keys = {item['key'] for item in search_result}
+    missing = [key for key in snippets if key not in found_keys]
+    for i in range(0, len(missing), 50):
+        try:
+            parent_items = zot.items(itemKey=",".join(missing[i:i + 50]), limit=50)
+        except Exception as e:
+            print(f"Could not fetch full-text matches {missing[i:i + 50]}: {e}")
+            continue
+        for parent_item in parent_items:
+            # Skip trashed items and children, as the remote top-level search does
+            if parent_item['data'].get('deleted') or parent_item['data']['itemType'] in ('attachment', 'note'):
+                continue
+            search_result.append(parent_item)
+            found_keys.add(parent_item['key'])
+
     # Gather annotation notes from children
     annotation_notes = []
     for item in search_result:
@@ -124,16 +253,23 @@ def main():
                 bread_crumb = collection_info.get('Name', '')
         else:
             bread_crumb = ''
+        # Full-text context snippets for this item, added after rtf_replace so
+        # raw PDF text is never read as note markup
+        context = ""
+        if parent_id in snippets:
+            context = " \\line \\i Full text:\\i0" + "".join(
+                " \\line \\fs20 " + rtf_escape(clean_note_text(snippet)) + " \\fs24"
+                for snippet in snippets[parent_id]
+            )
         # Compose RTF package
         package = (
             "\\i " + bread_crumb + "\\i0 \\line " +
             "\\fs28 \\b " + parent_title + " (" + parent_date + ") \\b0 \\fs22 \\line " +
             parent_creators + " \\line \\fs24 " + notes_raw
         ) if notes_raw else "\\i No Notes"
-        notes.append(package)
+        notes.append(rtf_replace(package) + context)
 
     output = "\\par".join(notes)
-    output = rtf_replace(output)
 
     timestamp = datetime.datetime.strftime(datetime.datetime.now(), '%Y-%m-%d')
     out_path = f"{file_path}{search_query}_Zotero_notes_{timestamp}.rtf"
@@ -12,6 +12,7 @@ ZOTERO_CONFIGS = {
         "secretKey": SECRET_KEY,
         "filePath": FILE_PATH,
         "searchQuery": "innovation",
+        # "fullTextCache": FILE_PATH + ".zotero_fulltext.json.gz",  # Local PDF full-text cache
     },
     "groupNotes": {
         "userID": USER_ID,